@@ -1,5 +1,6 @@
 import copy
 import os
+import queue
 import threading
 import time
 from contextlib import suppress
@@ -18,6 +19,7 @@ from panoptes.utils.images import fits as fits_utils
 from panoptes.utils.library import load_module
 
 from panoptes.pocs.base import PanBase
+from panoptes.pocs.utils.quicklook import RunningStack
 
 
 class AbstractCamera(PanBase, metaclass=ABCMeta):
@@ -112,6 +114,11 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
         # By default assume camera isn't capable of internal darks.
         self._internal_darks = kwargs.get('internal_darks', False)
 
+        # Running quick-look co-add for the current sequence, see `_update_quicklook`.
+        self._quicklook_stack = None
+        self._quicklook_dir = None
+        self._quicklook_lock = threading.Lock()
+
         # Set up any subcomponents.
         self.subcomponents = dict()
         for attr_name, class_path in self._SUBCOMPONENT_LIST.items():
@@ -394,7 +401,10 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
         exptime = kwargs.pop('exptime', observation.exptime.value)
 
         # start the exposure
-        self.take_exposure(seconds=exptime, filename=file_path, blocking=blocking, **kwargs)
+        readout_thread = self.take_exposure(seconds=exptime,
+                                            filename=file_path,
+                                            blocking=blocking,
+                                            **kwargs)
 
         # Add most recent exposure to list
         if self.is_primary:
@@ -409,6 +419,7 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
             name=f'Thread-{image_id}',
             target=self.process_exposure,
             args=(metadata, observation_event),
+            kwargs=dict(exposure_thread=readout_thread),
             daemon=True)
         t.start()
 
@@ -419,6 +430,73 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
 
         return observation_event
 
+    def take_sequence(self,
+                      observation,
+                      num_exposures=None,
+                      headers=None,
+                      blocking=False,
+                      max_queued=None,
+                      result_queue=None,
+                      **kwargs):
+        """Take a sequence of exposures, overlapping processing with the next exposure.
+
+        Exposure N+1 is started as soon as the readout of exposure N has finished. The
+        processing of each frame (see `process_exposure`) is handed to a background
+        worker via a bounded queue, so the shutter is not held closed while headers are
+        written, pretty images made or files compressed. If processing falls more than
+        `max_queued` frames behind then the next exposure will wait for a free slot.
+
+        Args:
+            observation (~panoptes.pocs.scheduler.observation.Observation): Object
+                describing the observation.
+            num_exposures (int, optional): Number of exposures to take, default is the
+                `exp_set_size` of the observation.
+            headers (dict, optional): Header data to be saved along with each file.
+            blocking (bool): If method should wait for the whole sequence to be processed
+                before returning, default False.
+            max_queued (int, optional): Maximum number of frames waiting to be processed
+                before the next exposure is delayed. If not given will use the
+                `observations.sequence_max_queued` config item, or 2 if that isn't set.
+            result_queue (queue.Queue, optional): If given the metadata of each exposure
+                will be put on this queue as soon as that exposure has been processed.
+            **kwargs (dict): Optional keyword arguments (`exptime`), passed to `take_exposure`.
+
+        Returns:
+            threading.Event: An event to be set when all of the exposures in the sequence
+                have been processed.
+        """
+        if num_exposures is None:
+            num_exposures = observation.exp_set_size
+
+        if max_queued is None:
+            max_queued = self.get_config('observations.sequence_max_queued', default=2)
+
+        sequence_event = threading.Event()
+        processing_queue = queue.Queue(maxsize=max(int(max_queued), 1))
+
+        processing_thread = threading.Thread(name=f'Thread-{self.uid}-sequence-processing',
+                                             target=self._process_sequence,
+                                             args=(processing_queue,
+                                                   sequence_event,
+                                                   result_queue),
+                                             daemon=True)
+        processing_thread.start()
+
+        exposure_thread = threading.Thread(name=f'Thread-{self.uid}-sequence',
+                                           target=self._run_sequence,
+                                           args=(observation,
+                                                 num_exposures,
+                                                 headers,
+                                                 processing_queue),
+                                           kwargs=kwargs,
+                                           daemon=True)
+        exposure_thread.start()
+
+        if blocking:
+            sequence_event.wait()
+
+        return sequence_event
+
     def take_exposure(self,
                       seconds=1.0 * u.second,
                       filename=None,
@@ -526,17 +604,20 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
                          observation_event,
                          compress_fits=None,
                          record_observations=None,
-                         make_pretty_images=None):
+                         make_pretty_images=None,
+                         make_quicklook=None,
+                         exposure_thread=None):
         """ Processes the exposure.
 
         Performs the following steps:
 
             1. First checks to make sure that the file exists on the file system.
             2. Calls `_process_fits` with the filename and info, which is specific to each camera.
-            3. Makes pretty images if requested.
-            4. Records observation metadata if requested.
-            5. Compresses FITS files if requested.
-            6. Sets the observation_event.
+            3. Adds the frame to the running quick-look co-add if requested.
+            4. Makes pretty images if requested.
+            5. Records observation metadata if requested.
+            6. Compresses FITS files if requested.
+            7. Sets the observation_event.
 
         If the camera is a primary camera, extract the jpeg image and save metadata to database
         `current` collection. Saves metadata to `observations` collection for all images.
@@ -553,13 +634,23 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
             make_pretty_images (bool or None): If should make a jpg from raw image.
                 If None (default), checks the `observations.make_pretty_images`
                 config-server key.
+            make_quicklook (bool or None): If the frame should be added to the running
+                quick-look co-add and statistics for its sequence. If None (default), checks
+                the `observations.make_quicklook` config-server key.
+            exposure_thread (threading.Thread or None): The readout thread returned by
+                `take_exposure`. If given will wait for this thread to finish rather than
+                for the camera to stop exposing, which allows the next exposure to already
+                be under way while this one is processed.
 
         Raises:
             FileNotFoundError: If the FITS file isn't at the specified location.
         """
         # Wait for exposure to complete. Timeout handled by exposure thread.
-        while self.is_exposing:
-            time.sleep(1)
+        if exposure_thread is not None:
+            exposure_thread.join()
+        else:
+            while self.is_exposing:
+                time.sleep(1)
 
         self.logger.debug(f'Starting exposure processing for {observation_event}')
 
@@ -569,6 +660,9 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
         if make_pretty_images is None:
             make_pretty_images = self.get_config('observations.make_pretty_images', default=False)
 
+        if make_quicklook is None:
+            make_quicklook = self.get_config('observations.make_quicklook', default=False)
+
         image_id = metadata['image_id']
         seq_id = metadata['sequence_id']
         file_path = metadata['file_path']
@@ -585,6 +679,12 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
         file_path = self._process_fits(file_path, metadata)
         self.logger.debug(f'Finished FITS processing for {file_path}')
 
+        if make_quicklook:
+            try:
+                metadata['frame_stats'] = self._update_quicklook(file_path, metadata)
+            except Exception as e:  # pragma: no cover
+                self.logger.warning(f'Problem updating quick-look for {image_id}: {e!r}')
+
         # TODO make this async and take it out of camera.
         if make_pretty_images:
             try:
@@ -815,6 +915,122 @@ class AbstractCamera(PanBase, metaclass=ABCMeta):
             # Make sure this gets set regardless of any errors
             self._is_exposing_event.clear()
 
+    def _run_sequence(self, observation, num_exposures, headers, processing_queue, **kwargs):
+        """Take the exposures for `take_sequence`, queueing each one for processing.
+
+        Runs in its own thread. A `None` is always put on the processing queue at the end
+        to signal that no more exposures are coming.
+        """
+        exptime = kwargs.pop('exptime', observation.exptime.value)
+        try:
+            for exp_num in range(num_exposures):
+                # Each exposure in the sequence needs its own start time (and image_id).
+                exp_headers = dict(headers or {})
+                exp_headers.pop('start_time', None)
+
+                _, file_path, image_id, metadata = self._setup_observation(observation,
+                                                                           exp_headers,
+                                                                           None,
+                                                                           exptime=exptime)
+
+                self.logger.debug(f'Starting exposure {exp_num + 1}/{num_exposures} of '
+                                  f'sequence on {self}: {image_id}')
+                readout_thread = self.take_exposure(seconds=exptime, filename=file_path, **kwargs)
+
+                if self.is_primary:
+                    observation.exposure_list[image_id] = file_path
+
+                # Only wait for the readout, processing happens in the background.
+                readout_thread.join()
+                if self.exposure_error is not None:
+                    self.logger.error(f'Stopping sequence on {self}: {self.exposure_error}')
+                    break
+
+                # Blocks if processing has fallen too far behind.
+                processing_queue.put((metadata, readout_thread))
+        except Exception as err:
+            self.logger.error(f'Error during exposure sequence on {self}: {err!r}')
+            self._exposure_error = repr(err)
+        finally:
+            processing_queue.put(None)
+
+    def _process_sequence(self, processing_queue, sequence_event, result_queue=None):
+        """Process the exposures for `take_sequence` as they are read out.
+
+        Runs in its own thread until a `None` is taken from the processing queue.
+        """
+        try:
+            while True:
+                item = processing_queue.get()
+                if item is None:
+                    break
+
+                metadata, readout_thread = item
+                try:
+                    self.process_exposure(metadata, threading.Event(),
+                                          exposure_thread=readout_thread)
+                except Exception as err:
+                    self.logger.warning(f'Problem processing {metadata["image_id"]}: {err!r}')
+                    continue
+
+                if result_queue is not None:
+                    result_queue.put(metadata)
+        finally:
+            with suppress(Exception):
+                self._write_quicklook()
+            sequence_event.set()
+
+    def _update_quicklook(self, file_path, metadata):
+        """Add a frame to the running quick-look co-add for its sequence.
+
+        Only the stack for the current sequence is held in memory. When a frame from a
+        new sequence arrives the previous stack is written out and dropped. The co-add
+        is also written every `observations.quicklook_interval` frames (default 5).
+
+        Args:
+            file_path (str): Path to the FITS file of the frame.
+            metadata (dict): The metadata for the frame.
+
+        Returns:
+            dict: The statistics for the frame (background, noise, saturated_fraction).
+        """
+        sequence_id = metadata['sequence_id']
+        with self._quicklook_lock:
+            stack = self._quicklook_stack
+            if stack is None or stack.sequence_id != sequence_id:
+                if stack is not None:
+                    self._write_quicklook(stack, self._quicklook_dir)
+                self.logger.debug(f'Starting quick-look co-add for {sequence_id}')
+                stack = RunningStack(sequence_id)
+                self._quicklook_stack = stack
+                self._quicklook_dir = os.path.dirname(file_path)
+
+        frame_stats = stack.add_frame(fits.getdata(file_path), image_id=metadata['image_id'])
+        self.logger.debug(f'Frame stats for {metadata["image_id"]}: {frame_stats!r}')
+
+        interval = self.get_config('observations.quicklook_interval', default=5)
+        if stack.num_frames % max(int(interval), 1) == 0:
+            self._write_quicklook(stack, self._quicklook_dir)
+
+        return frame_stats
+
+    def _write_quicklook(self, stack=None, output_dir=None):
+        """Write the quick-look co-add as `quicklook.fits` and `quicklook.jpg`.
+
+        Args:
+            stack (panoptes.pocs.utils.quicklook.RunningStack, optional): The stack to
+                write, default is the stack for the current sequence.
+            output_dir (str, optional): Directory to write to, default is the directory of
+                the current sequence.
+        """
+        stack = stack or self._quicklook_stack
+        output_dir = output_dir or self._quicklook_dir
+        if stack is None or stack.num_frames == 0:
+            return
+
+        stack.write(os.path.join(output_dir, 'quicklook.fits'),
+                    jpeg_path=os.path.join(output_dir, 'quicklook.jpg'))
+
     def _create_fits_header(self, seconds, dark=None):
         header = fits.Header()
         header.set('INSTRUME', self.uid, 'Camera serial number')
@@ -1,8 +1,10 @@
 import re
 import shutil
 import subprocess
+from contextlib import suppress
 
 from panoptes.pocs.camera import AbstractCamera
+from panoptes.pocs.camera.gphoto.shell import GPhoto2Shell
 from panoptes.utils import error, listify
 
 import re
@@ -53,11 +55,18 @@ class AbstractGPhotoCamera(AbstractCamera):  # pragma: no cover
 
     """ Abstract camera class that uses gphoto2 interaction
 
+    By default commands are sent through a persistent `gphoto2 --shell` session
+    (see `panoptes.pocs.camera.gphoto.shell.GPhoto2Shell`) rather than starting a
+    new gphoto2 process for each command, and property values are cached between
+    exposures.
+
     Args:
         config(Dict):   Config key/value pairs, defaults to empty dict.
+        use_shell (bool): If a persistent gphoto2 shell session should be used,
+            default True. If False a new gphoto2 process is started for each command.
     """
 
-    def __init__(self, *arg, **kwargs):
+    def __init__(self, use_shell=True, *arg, **kwargs):
         super().__init__(*arg, **kwargs)
 
         self.properties = None
@@ -70,6 +79,12 @@ class AbstractGPhotoCamera(AbstractCamera):  # pragma: no cover
         # Setup a holder for the process
         self._proc = None
 
+        # Persistent session and cache of property values read from or set on the camera.
+        self._shell = None
+        if use_shell:
+            self._shell = GPhoto2Shell(self.port, gphoto2=self._gphoto2, timeout=self._timeout)
+        self._property_cache = dict()
+
         # Explicitly set holders for some of the hardware subcomponents until
         # TODO fix the setting of the attribute.
         self.focuser = None
@@ -144,12 +159,17 @@ class AbstractGPhotoCamera(AbstractCamera):  # pragma: no cover
 
     def set_property(self, prop, val):
         """ Set a property on the camera """
-        set_cmd = ['--set-config', '{}={}'.format(prop, val)]
+        if self._shell is not None:
+            self._shell.run(f'set-config {prop}={val}')
+        else:
+            set_cmd = ['--set-config', '{}={}'.format(prop, val)]
+
+            self.command(set_cmd)
 
-        self.command(set_cmd)
+            # Forces the command to wait
+            self.get_command_result()
 
-        # Forces the command to wait
-        self.get_command_result()
+        self._property_cache[prop] = str(val)
 
     def set_properties(self, prop2index, prop2value):
         """ Sets a number of properties all at once, by index or value.
@@ -160,23 +180,46 @@ class AbstractGPhotoCamera(AbstractCamera):  # pragma: no cover
             prop2value (dict): A dict with keys corresponding to the property to
             be set and values corresponding to the literal value
         """
-        set_cmd = list()
-        for prop, val in prop2index.items():
-            set_cmd.extend(['--set-config-index', '{}={}'.format(prop, val)])
+        if self._shell is not None:
+            shell_cmds = [f'set-config-index {prop}={val}' for prop, val in prop2index.items()]
+            shell_cmds.extend(f'set-config-value {prop}={val}' for prop, val in prop2value.items())
+            self._shell.run_many(shell_cmds)
+        else:
+            set_cmd = list()
+            for prop, val in prop2index.items():
+                set_cmd.extend(['--set-config-index', '{}={}'.format(prop, val)])
+            for prop, val in prop2value.items():
+                set_cmd.extend(['--set-config-value', '{}={}'.format(prop, val)])
+
+            self.command(set_cmd)
+
+            # Forces the command to wait
+            self.get_command_result()
+
+        # We only know the value (not the label) of the index based properties.
+        for prop in prop2index.keys():
+            self._property_cache.pop(prop, None)
         for prop, val in prop2value.items():
-            set_cmd.extend(['--set-config-value', '{}={}'.format(prop, val)])
+            self._property_cache[prop] = str(val)
 
-        self.command(set_cmd)
+    def get_property(self, prop, use_cache=True):
+        """ Gets a property from the camera
 
-        # Forces the command to wait
-        self.get_command_result()
+        Args:
+            prop (str): The name of the property.
+            use_cache (bool): If a previously read (or set) value can be returned without
+                asking the camera, default True.
+        """
+        if use_cache and prop in self._property_cache:
+            return self._property_cache[prop]
 
-    def get_property(self, prop):
-        """ Gets a property from the camera """
-        set_cmd = ['--get-config', '{}'.format(prop)]
+        if self._shell is not None:
+            result = self._shell.run(f'get-config {prop}')
+        else:
+            set_cmd = ['--get-config', '{}'.format(prop)]
 
-        self.command(set_cmd)
-        result = self.get_command_result()
+            self.command(set_cmd)
+            result = self.get_command_result()
 
         output = ''
         for line in result.split('\n'):
@@ -184,19 +227,36 @@ class AbstractGPhotoCamera(AbstractCamera):  # pragma: no cover
             if match:
                 output = match.group(1)
 
+        if output:
+            self._property_cache[prop] = output
+
         return output
 
+    def clear_property_cache(self):
+        """ Forget all cached property values so they are read from the camera again """
+        self._property_cache.clear()
+
     def load_properties(self):
         ''' Load properties from the camera
         Reads all the configuration properties available via gphoto2 and populates
         a local list with these entries.
         '''
         self.logger.debug('Get All Properties')
-        command = ['--list-all-config']
+        if self._shell is not None:
+            result = self._shell.run('list-all-config')
+        else:
+            self.command(['--list-all-config'])
+            result = self.get_command_result()
 
-        self.properties = parse_config(self.command(command))
+        self.properties = parse_config(result.split('\n'))
 
         if self.properties:
             self.logger.debug('  Found {} properties'.format(len(self.properties)))
         else:
             self.logger.warning('  Could not determine properties.')
+
+    def __del__(self):
+        """ Close the gphoto2 session. """
+        with suppress(Exception):
+            if self._shell is not None:
+                self._shell.stop()
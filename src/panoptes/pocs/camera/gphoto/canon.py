@@ -1,10 +1,13 @@
 import os
+import re
 import subprocess
 from abc import ABC
+from concurrent import futures
 
 from astropy import units as u
 from threading import Event
-from threading import Timer
+from threading import Lock
+from threading import Thread
 
 from panoptes.utils import current_time
 from panoptes.utils import CountdownTimer
@@ -15,14 +18,30 @@ from panoptes.pocs.camera.gphoto import AbstractGPhotoCamera
 
 
 class Camera(AbstractGPhotoCamera, ABC):
+    """Canon DSLR camera controlled via gphoto2.
+
+    Args:
+        conversion_pool (concurrent.futures.Executor, optional): Pool used to convert the
+            CR2 files to FITS. If given (the `Observatory` assigns a shared process pool
+            when the camera is added) the readout finishes as soon as the conversion has
+            been submitted, so the next exposure can start while the conversion runs. If
+            None (default) the conversion is done in the readout thread.
+    """
 
     def __init__(self, *args, **kwargs):
+        conversion_pool = kwargs.pop('conversion_pool', None)
         kwargs['readout_time'] = 6.0
         kwargs['file_extension'] = 'cr2'
         super().__init__(*args, **kwargs)
 
-        # Hold on to the exposure process for polling.
+        # Hold on to the exposure process (or shell command future) for polling.
         self._exposure_proc = None
+        self._exposure_future = None
+
+        # CR2 to FITS conversions in progress, keyed by CR2 path.
+        self.conversion_pool = conversion_pool
+        self._conversions = dict()
+        self._conversions_lock = Lock()
 
         self.logger.debug("Connecting GPhoto2 camera")
         self.connect()
@@ -83,8 +102,8 @@ class Camera(AbstractGPhotoCamera, ABC):
 
         Gathers various header information, sets the file path, and calls
         `take_exposure`. Also creates a `threading.Event` object and a
-        `threading.Timer` object. The timer calls `process_exposure` after the
-        set amount of time is expired (`observation.exptime + self.readout_time`).
+        `threading.Thread` object. The thread calls `process_exposure` once the
+        readout (and the conversion to FITS) has finished.
 
         Note:
             If a `filename` is passed in it can either be a full path that includes
@@ -109,7 +128,7 @@ class Camera(AbstractGPhotoCamera, ABC):
                                                                          filename,
                                                                          **kwargs)
 
-        exposure_event = self.take_exposure(seconds=exptime, filename=file_path)
+        readout_thread = self.take_exposure(seconds=exptime, filename=file_path)
 
         # Add most recent exposure to list
         if self.is_primary:
@@ -118,11 +137,12 @@ class Camera(AbstractGPhotoCamera, ABC):
             else:
                 observation.exposure_list[image_id] = file_path.replace('.cr2', '.fits')
 
-        # Process the image after a set amount of time
-        wait_time = exptime + self.readout_time
-
-        t = Timer(wait_time, self.process_exposure, (metadata, observation_event))
-        t.name = f'{self.name}Thread'
+        # Process the image once it has been read out.
+        t = Thread(name=f'{self.name}Thread',
+                   target=self.process_exposure,
+                   args=(metadata, observation_event),
+                   kwargs=dict(exposure_thread=readout_thread),
+                   daemon=True)
         t.start()
 
         return observation_event
@@ -131,7 +151,10 @@ class Camera(AbstractGPhotoCamera, ABC):
         """Take an exposure for given number of seconds and saves to provided filename
 
         Note:
-            See `scripts/take-pic.sh`
+            If the camera has a gphoto2 shell session the exposure commands are put on
+            its command queue, otherwise `scripts/take-pic.sh` is run in a new process.
+            The shell commands are the same as those used by the script, except that
+            the bulb and capture target settings are only made once in `connect`.
 
             Tested With:
                 * Canon EOS 100D
@@ -140,11 +163,27 @@ class Camera(AbstractGPhotoCamera, ABC):
             seconds (u.second, optional): Length of exposure
             filename (str, optional): Image is saved to this filename
         """
-        script_path = os.path.expandvars('$POCS/scripts/take-pic.sh')
-
         # Make sure we have just the value, no units
         seconds = get_quantity_value(seconds)
 
+        readout_args = (filename, header)
+
+        if self._shell is not None:
+            self._is_exposing_event.set()
+            shell_cmds = [
+                'set-config eosremoterelease=Immediate',  # Open shutter
+                f'wait-event {seconds}s',
+                'set-config eosremoterelease=4',  # Release Full, close shutter
+                f'lcd {os.path.dirname(filename)}',
+                'wait-event-and-download 2s',
+            ]
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            self._exposure_future = self._shell.submit(shell_cmds,
+                                                       timeout=seconds + self._timeout)
+            return readout_args
+
+        script_path = os.path.expandvars('$POCS/scripts/take-pic.sh')
+
         run_cmd = [script_path, self.port, str(seconds), filename]
 
         # Take Picture
@@ -157,11 +196,23 @@ class Camera(AbstractGPhotoCamera, ABC):
         except error.InvalidCommand as e:
             self.logger.warning(e)
         finally:
-            readout_args = (filename, header)
             return readout_args
 
     def _readout(self, cr2_path=None, info=None):
-        """Reads out the image as a CR2 and converts to FITS"""
+        """Reads out the image as a CR2 and converts to FITS
+
+        If the camera has a `conversion_pool` the conversion is only submitted here
+        and `_process_fits` waits for it to finish.
+        """
+        if self.conversion_pool is not None:
+            self.logger.debug(f"Submitting CR2 -> FITS conversion: {cr2_path}")
+            with self._conversions_lock:
+                self._conversions[cr2_path] = self.conversion_pool.submit(cr2_utils.cr2_to_fits,
+                                                                          cr2_path,
+                                                                          headers=info,
+                                                                          remove_cr2=False)
+            return cr2_path.replace('.cr2', '.fits')
+
         self.logger.debug(f"Converting CR2 -> FITS: {cr2_path}")
         fits_path = cr2_utils.cr2_to_fits(cr2_path, headers=info, remove_cr2=False)
         return fits_path
@@ -170,26 +221,40 @@ class Camera(AbstractGPhotoCamera, ABC):
         """
         Add FITS headers from info the same as images.cr2_to_fits()
         """
-        file_path = file_path.replace('.cr2', '.fits')
+        with self._conversions_lock:
+            conversion = self._conversions.pop(file_path, None)
+
+        if conversion is not None:
+            self.logger.debug(f"Waiting for CR2 -> FITS conversion: {file_path}")
+            file_path = conversion.result()
+            self.logger.debug(f"Finished CR2 -> FITS conversion: {file_path}")
+        else:
+            file_path = file_path.replace('.cr2', '.fits')
+
         return super()._process_fits(file_path, info)
 
-    def _poll_exposure(self, readout_args):
+    def _poll_exposure(self, readout_args, exposure_time=None, timeout=None, interval=0.01):
         timer = CountdownTimer(duration=self._timeout)
         try:
-            try:
-                # See if the command has finished.
-                while self._exposure_proc.poll() is None:
-                    # Sleep if not done yet.
-                    timer.sleep()
-            except subprocess.TimeoutExpired:
-                self.logger.warning(f'Timeout on exposure process for {self.name}')
-                self._exposure_proc.kill()
-                outs, errs = self._exposure_proc.communicate(timeout=10)
-                if errs is not None and errs > '':
-                    self.logger.error(f'Camera exposure errors: {errs}')
+            if self._exposure_future is not None:
+                # Wait for the shell session to run the exposure commands.
+                self._wait_for_shell_exposure(readout_args[0], timeout=timeout)
+            else:
+                try:
+                    # See if the command has finished.
+                    while self._exposure_proc.poll() is None:
+                        # Sleep if not done yet.
+                        timer.sleep()
+                except subprocess.TimeoutExpired:
+                    self.logger.warning(f'Timeout on exposure process for {self.name}')
+                    self._exposure_proc.kill()
+                    outs, errs = self._exposure_proc.communicate(timeout=10)
+                    if errs is not None and errs > '':
+                        self.logger.error(f'Camera exposure errors: {errs}')
         except (RuntimeError, error.PanError) as err:
             # Error returned by driver at some point while polling
             self.logger.error('Error while waiting for exposure on {}: {}'.format(self, err))
+            self._exposure_error = repr(err)
             raise err
         else:
             # Camera type specific readout function
@@ -197,4 +262,22 @@ class Camera(AbstractGPhotoCamera, ABC):
         finally:
             self.logger.debug(f'Setting exposure event for {self.name}')
             self._exposure_proc = None
+            self._exposure_future = None
             self._is_exposing_event.clear()  # Make sure this gets set regardless of readout errors
+
+    def _wait_for_shell_exposure(self, filename, timeout=None):
+        """Wait for the shell exposure commands and move the downloaded file to filename."""
+        try:
+            responses = self._exposure_future.result(timeout=timeout)
+        except futures.TimeoutError:
+            raise error.Timeout(f'Timeout waiting for exposure commands on {self}')
+
+        # The file is downloaded with the name it has on the camera.
+        download_response = responses[-1]
+        match = re.search(r'Saving file as (.*)', download_response)
+        if match is None:
+            raise error.PanError(f'No image downloaded from {self}: {download_response!r}')
+
+        downloaded_path = os.path.join(os.path.dirname(filename), match.group(1).strip())
+        self.logger.debug(f'Moving {downloaded_path} to {filename}')
+        os.replace(downloaded_path, filename)
@@ -0,0 +1,204 @@
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from panoptes.utils import error
+from panoptes.pocs.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class GPhoto2Shell(object):
+    """A long-lived `gphoto2 --shell` session for a single camera.
+
+    Starting a new `gphoto2` process means re-opening the USB device, which can take
+    seconds. Instead this keeps one interactive shell open per camera port and sends
+    it commands one at a time. The output of each command is everything gphoto2
+    prints before its next prompt.
+
+    Commands can be run directly with `run`, which blocks until the response has
+    been read, or put on the session command queue with `submit`, which returns
+    a `concurrent.futures.Future`. Commands from different threads never interleave.
+
+    Args:
+        port (str): The port of the camera, e.g. 'usb:001,004'.
+        gphoto2 (str, optional): Path to the gphoto2 executable, default is to search
+            the PATH.
+        timeout (float, optional): Default number of seconds to wait for a response,
+            default 10.
+    """
+    prompt_pattern = re.compile(r'gphoto2: \{[^}]*\} [^>\n]*> ')
+
+    def __init__(self, port, gphoto2=None, timeout=10):
+        self.port = port
+        self.timeout = timeout
+
+        self._gphoto2 = gphoto2 or shutil.which('gphoto2')
+        if self._gphoto2 is None:
+            raise error.NotFound("Can't find gphoto2")
+
+        self._proc = None
+        self._reader_thread = None
+        self._responses = queue.Queue()
+        self._command_lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix=f'gphoto2-{port}')
+
+    @property
+    def is_running(self):
+        """True if the gphoto2 shell process is running."""
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self):
+        """Start the gphoto2 shell and wait for its first prompt."""
+        with self._command_lock:
+            if self.is_running:
+                return
+
+            run_cmd = [self._gphoto2, '--port', self.port, '--shell']
+            logger.debug(f'Starting gphoto2 shell: {run_cmd}')
+            try:
+                self._proc = subprocess.Popen(run_cmd,
+                                              stdin=subprocess.PIPE,
+                                              stdout=subprocess.PIPE,
+                                              stderr=subprocess.STDOUT,
+                                              bufsize=0)
+            except OSError as e:
+                raise error.InvalidCommand(f"Can't start gphoto2 shell: {e!r} \t {run_cmd}")
+
+            self._responses = queue.Queue()
+            self._reader_thread = threading.Thread(name=f'gphoto2-{self.port}-reader',
+                                                   target=self._read_output,
+                                                   args=(self._proc.stdout, self._responses),
+                                                   daemon=True)
+            self._reader_thread.start()
+
+            # Anything before the first prompt is just the startup banner.
+            self._get_response(self.timeout)
+
+    def stop(self):
+        """Exit the gphoto2 shell."""
+        with self._command_lock:
+            if not self.is_running:
+                self._proc = None
+                return
+
+            logger.debug(f'Stopping gphoto2 shell on {self.port}')
+            try:
+                self._proc.stdin.write(b'exit\n')
+                self._proc.wait(timeout=self.timeout)
+            except Exception:
+                self._proc.kill()
+                self._proc.wait()
+            finally:
+                self._proc = None
+
+    def run(self, cmd, timeout=None):
+        """Run a single shell command and return its output.
+
+        Args:
+            cmd (str): The shell command, e.g. 'get-config /main/status/serialnumber'.
+            timeout (float, optional): Seconds to wait for the response, default is
+                the session timeout.
+
+        Returns:
+            str: Everything printed by gphoto2 in response to the command.
+
+        Raises:
+            error.Timeout: If no response was received in time. The shell is restarted
+                before the next command, so later responses are not out of step.
+            error.PanError: If the shell exited while running the command.
+        """
+        timeout = timeout or self.timeout
+        with self._command_lock:
+            self.start()
+
+            logger.trace(f'gphoto2 shell command on {self.port}: {cmd}')
+            try:
+                self._proc.stdin.write(f'{cmd}\n'.encode())
+            except (OSError, ValueError) as e:
+                self.stop()
+                raise error.PanError(f'gphoto2 shell on {self.port} not accepting commands: {e!r}')
+
+            response = self._get_response(timeout)
+
+        # Drop the command if the shell echoed it back.
+        lines = response.splitlines()
+        if lines and lines[0].strip() == cmd:
+            lines = lines[1:]
+
+        return '\n'.join(lines)
+
+    def run_many(self, cmds, timeout=None):
+        """Run a list of shell commands, without other commands in between.
+
+        Args:
+            cmds (list of str): The shell commands.
+            timeout (float, optional): Seconds to wait for each response.
+
+        Returns:
+            list of str: The output of each command.
+        """
+        with self._command_lock:
+            return [self.run(cmd, timeout=timeout) for cmd in cmds]
+
+    def submit(self, cmds, timeout=None):
+        """Put a list of shell commands on the session command queue.
+
+        Args:
+            cmds (list of str): The shell commands.
+            timeout (float, optional): Seconds to wait for each response.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the list of responses from `run_many`.
+        """
+        return self._executor.submit(self.run_many, cmds, timeout=timeout)
+
+    def _get_response(self, timeout):
+        try:
+            response = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            # We no longer know where the output of the next command will start.
+            self._kill()
+            raise error.Timeout(f'Timeout waiting for gphoto2 shell on {self.port}')
+
+        if response is None:
+            self._proc = None
+            raise error.PanError(f'gphoto2 shell on {self.port} exited unexpectedly')
+
+        return response
+
+    def _kill(self):
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+        self._proc = None
+
+    def _read_output(self, stdout, responses):
+        """Split the shell output into responses at each prompt. Runs in its own thread."""
+        buffer = ''
+        while True:
+            chunk = os.read(stdout.fileno(), 4096)
+            if not chunk:
+                break
+
+            buffer += chunk.decode(errors='replace')
+            match = self.prompt_pattern.search(buffer)
+            while match:
+                responses.put(buffer[:match.start()])
+                buffer = buffer[match.end():]
+                match = self.prompt_pattern.search(buffer)
+
+        # Signal the end of the process.
+        responses.put(None)
+
+    def __del__(self):
+        try:
+            self.stop()
+            self._executor.shutdown(wait=False)
+        except Exception:
+            pass
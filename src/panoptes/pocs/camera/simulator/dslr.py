@@ -48,6 +48,15 @@ class Camera(AbstractCamera):
                                         filename,
                                         **kwargs)
 
+    def take_sequence(self, observation, *args, **kwargs):
+
+        exptime = kwargs.get('exptime', observation.exptime.value)
+        if exptime > 1:
+            kwargs['exptime'] = 1
+            self.logger.debug("Trimming camera simulator sequence exposures to 1 s")
+
+        return super().take_sequence(observation, *args, **kwargs)
+
     def _end_exposure(self):
         self._is_exposing_event.clear()
 
@@ -1,6 +1,7 @@
 import os
 import subprocess
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 from astropy import units as u
@@ -53,6 +54,7 @@ class Observatory(PanBase):
         self.cameras = OrderedDict()
 
         self._primary_camera = None
+        self._conversion_pool = None
         if cameras:
             self.logger.info(f'Adding cameras to the observatory: {cameras}')
             for cam_name, camera in cameras.items():
@@ -201,6 +203,10 @@ class Observatory(PanBase):
         if camera.is_primary:
             self.primary_camera = camera
 
+        # Cameras that convert their raw files (e.g. CR2 -> FITS) share one worker pool.
+        if hasattr(camera, 'conversion_pool') and camera.conversion_pool is None:
+            camera.conversion_pool = self.conversion_pool
+
     def remove_camera(self, cam_name):
         """Remove cam_name from list of attached cameras.
 
@@ -270,6 +276,23 @@ class Observatory(PanBase):
             self.mount.disconnect()
         if self.dome:
             self.dome.disconnect()
+        if self._conversion_pool is not None:
+            self._conversion_pool.shutdown(wait=True)
+            self._conversion_pool = None
+
+    @property
+    def conversion_pool(self):
+        """Process pool shared by the cameras for converting raw images to FITS.
+
+        The pool is created on first use with `observations.conversion_workers`
+        processes, or one per CPU if that isn't set.
+        """
+        if self._conversion_pool is None:
+            max_workers = self.get_config('observations.conversion_workers', default=None)
+            self.logger.debug(f'Creating image conversion pool with max_workers={max_workers}')
+            self._conversion_pool = ProcessPoolExecutor(max_workers=max_workers)
+
+        return self._conversion_pool
 
     @property
     def status(self):
@@ -481,6 +504,47 @@ class Observatory(PanBase):
 
         return observing_events
 
+    def observe_sequence(self, num_exposures=None, result_queue=None):
+        """Take a sequence of images for the current observation
+
+        Like `observe` but each camera takes `num_exposures` images back-to-back via
+        `AbstractCamera.take_sequence`, with the processing of each image overlapping
+        the next exposure.
+
+        Args:
+            num_exposures (int, optional): Number of exposures to take with each camera,
+                default is the remainder of the current exposure set.
+            result_queue (queue.Queue, optional): Passed to `take_sequence`, receives the
+                metadata of each image as soon as it has been processed.
+
+        Returns:
+            dict: The sequence events for each camera, keyed by camera name.
+        """
+        observation = self.current_observation
+
+        if num_exposures is None:
+            num_exposures = observation.exp_set_size - (
+                    observation.current_exp_num % observation.exp_set_size)
+
+        # Get observatory metadata
+        headers = self.get_standard_headers()
+
+        # List of camera events to wait for to signal sequence is done processing
+        sequence_events = dict()
+
+        for cam_name, camera in self.cameras.items():
+            self.logger.debug(f"Starting sequence of {num_exposures} for camera: {cam_name}")
+
+            try:
+                sequence_events[cam_name] = camera.take_sequence(observation,
+                                                                 num_exposures=num_exposures,
+                                                                 headers=headers,
+                                                                 result_queue=result_queue)
+            except Exception as e:
+                self.logger.error(f"Problem starting sequence: {e!r}")
+
+        return sequence_events
+
     def analyze_recent(self):
         """Analyze the most recent exposure
 
@@ -1,3 +1,5 @@
+import queue
+
 from panoptes.utils import error
 from panoptes.utils.time import wait_for_events
 
@@ -8,22 +10,45 @@ def on_enter(event_data):
     """Take an observation image.
 
     This state is responsible for taking the actual observation image.
+
+    If the `observations.pipeline_exposures` config item is True then the rest of
+    the current exposure set is taken as one pipelined sequence, with each image
+    being processed while the next one is exposing.
      """
     pocs = event_data.model
     pocs.say(f"🔭🔭🔭 I'm observing {pocs.observatory.current_observation.field.field_name}! 🔭🔭🔭")
     pocs.next_state = 'parking'
 
     try:
-        maximum_duration = pocs.observatory.current_observation.exptime.value + MAX_EXTRA_TIME
+        observation = pocs.observatory.current_observation
+        maximum_duration = observation.exptime.value + MAX_EXTRA_TIME
+
+        if pocs.get_config('observations.pipeline_exposures', default=False):
+            num_exposures = observation.exp_set_size - (
+                    observation.current_exp_num % observation.exp_set_size)
+            maximum_duration *= num_exposures
+
+            # Start the sequence.
+            processed_images = queue.Queue()
+            observing_events = pocs.observatory.observe_sequence(num_exposures=num_exposures,
+                                                                 result_queue=processed_images)
+
+            def waiting_cb():
+                # Report on the images as they come out of the processing pipeline.
+                while not processed_images.empty():
+                    metadata = processed_images.get_nowait()
+                    pocs.logger.info(f'Processed image {metadata["image_id"]}')
+                pocs.logger.info(f'Waiting on an observation sequence of {num_exposures}.')
+        else:
+            # Start the observing.
+            observing_events = pocs.observatory.observe()
+
+            def waiting_cb():
+                # TODO Check for dead camera here and potential remove from list?
+                pocs.logger.info(f'Waiting on an observation.')
 
-        # Start the observing.
-        observing_events = pocs.observatory.observe()
         camera_events = list(observing_events.values())
 
-        def waiting_cb():
-            # TODO Check for dead camera here and potential remove from list?
-            pocs.logger.info(f'Waiting on an observation.')
-
         wait_for_events(camera_events, timeout=maximum_duration, callback=waiting_cb, sleep_delay=11)
 
     except error.Timeout:
@@ -3,6 +3,7 @@ import pytest
 import os
 import time
 import glob
+import queue
 from ctypes.util import find_library
 from contextlib import suppress
 
@@ -542,6 +543,27 @@ def test_observation_nofilter(camera, images_dir):
     assert len(glob.glob(observation_pattern)) == 1
 
 
+def test_sequence(camera, images_dir):
+    """
+    Tests functionality of take_sequence()
+    """
+    field = Field('Test Observation', '20h00m43.7135s +22d42m39.0645s')
+    observation = Observation(field, exptime=1.5 * u.second)
+    observation.seq_time = '19991231T235859'
+    processed = queue.Queue()
+    sequence_event = camera.take_sequence(observation,
+                                          num_exposures=3,
+                                          result_queue=processed,
+                                          max_queued=1,
+                                          blocking=True)
+    assert sequence_event.is_set()
+    assert processed.qsize() == 3
+    observation_pattern = os.path.join(images_dir, 'TestObservation',
+                                       camera.uid, observation.seq_time, '*.fits*')
+    assert len(glob.glob(observation_pattern)) == 3
+    assert not camera.is_exposing
+
+
 def test_autofocus_coarse(camera, patterns, counter):
     if camera.focuser is None:
         pytest.skip("Camera does not have a focuser")
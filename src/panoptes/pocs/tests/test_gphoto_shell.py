@@ -0,0 +1,78 @@
+import os
+import stat
+import sys
+
+import pytest
+
+from panoptes.pocs.camera.gphoto.shell import GPhoto2Shell
+from panoptes.utils import error
+
+FAKE_GPHOTO2 = f"""#!{sys.executable}
+import sys
+import time
+
+prompt = 'gphoto2: {{/tmp}} /> '
+sys.stdout.write('gphoto2 shell banner\\n' + prompt)
+sys.stdout.flush()
+for line in sys.stdin:
+    cmd = line.strip()
+    if cmd == 'exit':
+        break
+    elif cmd.startswith('get-config'):
+        out = 'Label: Serial Number\\nType: TEXT\\nCurrent: 123456\\nEND\\n'
+    elif cmd == 'hang':
+        time.sleep(5)
+        out = ''
+    else:
+        out = f'ran {{cmd}}\\n'
+    sys.stdout.write(out + prompt)
+    sys.stdout.flush()
+"""
+
+
+@pytest.fixture()
+def shell(tmp_path):
+    gphoto2 = tmp_path / 'gphoto2'
+    gphoto2.write_text(FAKE_GPHOTO2)
+    os.chmod(gphoto2, stat.S_IRWXU)
+
+    shell = GPhoto2Shell('usb:999,999', gphoto2=str(gphoto2), timeout=2)
+    yield shell
+    shell.stop()
+
+
+def test_run(shell):
+    assert not shell.is_running
+    response = shell.run('get-config serialnumber')
+    assert shell.is_running
+    assert 'Current: 123456' in response
+    assert 'banner' not in response
+
+    # The same process is used for the next command.
+    pid = shell._proc.pid
+    assert shell.run('set-config iso=1') == 'ran set-config iso=1'
+    assert shell._proc.pid == pid
+
+
+def test_run_many_and_submit(shell):
+    responses = shell.run_many(['one', 'two', 'three'])
+    assert responses == ['ran one', 'ran two', 'ran three']
+
+    future = shell.submit(['four', 'five'])
+    assert future.result(timeout=5) == ['ran four', 'ran five']
+
+
+def test_stop(shell):
+    shell.run('one')
+    shell.stop()
+    assert not shell.is_running
+    # Restarts for the next command.
+    assert shell.run('two') == 'ran two'
+
+
+def test_timeout(shell):
+    with pytest.raises(error.Timeout):
+        shell.run('hang', timeout=0.5)
+    assert not shell.is_running
+    # The next command gets its own response, not the one from the hung command.
+    assert shell.run('after') == 'ran after'
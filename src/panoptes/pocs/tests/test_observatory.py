@@ -70,6 +70,23 @@ def test_remove_cameras(observatory, cameras):
         observatory.remove_camera(cam_name)
 
 
+def test_conversion_pool(observatory, cameras):
+    # Simulated cameras don't convert their images so no pool is made for them.
+    assert observatory._conversion_pool is None
+
+    pool = observatory.conversion_pool
+    assert observatory.conversion_pool is pool
+    assert pool.submit(os.path.basename, '/var/panoptes/images/test.cr2').result() == 'test.cr2'
+
+    cam_name, camera = next(iter(cameras.items()))
+    camera.conversion_pool = None
+    observatory.add_camera(cam_name, camera)
+    assert camera.conversion_pool is pool
+
+    observatory.power_down()
+    assert observatory._conversion_pool is None
+
+
 def test_bad_site(config_host, config_port):
     set_config('location', {})
     with pytest.raises(error.PanError):
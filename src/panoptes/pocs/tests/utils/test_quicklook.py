@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
+from panoptes.pocs.utils.quicklook import RunningStack
+
+
+@pytest.fixture()
+def frames():
+    rng = np.random.default_rng(42)
+    return [rng.normal(1000, 10, size=(64, 64)).astype(np.uint16) for _ in range(6)]
+
+
+def test_running_mean(frames):
+    stack = RunningStack('PAN000_SC0001_19991231T235959', min_frames=len(frames))
+    for frame in frames:
+        stack.add_frame(frame)
+
+    assert stack.num_frames == len(frames)
+    assert stack.mean.dtype == np.float32
+    np.testing.assert_allclose(stack.mean, np.mean(frames, axis=0), rtol=1e-5)
+    np.testing.assert_allclose(stack.std, np.std(frames, axis=0, ddof=1), rtol=1e-3)
+
+
+def test_clipping(frames):
+    stack = RunningStack('PAN000_SC0001_19991231T235959', sigma=3, min_frames=3)
+    for frame in frames[:-1]:
+        stack.add_frame(frame)
+
+    # A cosmic ray should not make it into the co-add.
+    hit = frames[-1].copy()
+    hit[10, 10] = 60000
+    frame_stats = stack.add_frame(hit, image_id='hit')
+
+    assert frame_stats['image_id'] == 'hit'
+    assert stack.mean[10, 10] < 1100
+    assert stack.num_frames == len(frames)
+
+
+def test_frame_stats():
+    stack = RunningStack('PAN000_SC0001_19991231T235959')
+    data = np.full((10, 10), 500, dtype=np.uint16)
+    data[0, :5] = np.iinfo(np.uint16).max
+    frame_stats = stack.add_frame(data)
+
+    assert frame_stats['background'] == 500
+    assert frame_stats['noise'] == 0
+    assert frame_stats['saturated_fraction'] == 0.05
+
+
+def test_write(frames, tmp_path):
+    stack = RunningStack('PAN000_SC0001_19991231T235959')
+    with pytest.raises(ValueError):
+        stack.write(str(tmp_path / 'quicklook.fits'))
+
+    for frame in frames:
+        stack.add_frame(frame)
+
+    fits_path = str(tmp_path / 'quicklook.fits')
+    jpeg_path = str(tmp_path / 'quicklook.jpg')
+    assert stack.write(fits_path, jpeg_path=jpeg_path) == fits_path
+    assert os.path.exists(jpeg_path)
+
+    data, header = fits.getdata(fits_path, header=True)
+    assert header['NCOMBINE'] == len(frames)
+    assert header['SEQID'] == 'PAN000_SC0001_19991231T235959'
+    assert data.shape == frames[0].shape
@@ -0,0 +1,155 @@
+import os
+import threading
+
+import numpy as np
+from astropy.io import fits
+from astropy.stats import sigma_clipped_stats
+from matplotlib import image as mpimg
+
+from panoptes.pocs.utils.logger import get_logger
+
+logger = get_logger()
+
+
+class RunningStack(object):
+    """A running, sigma-clipped co-add of the frames in an observation sequence.
+
+    Frames are added one at a time and the per-pixel mean and variance are updated
+    in place (Welford's algorithm), so memory use is fixed at a few float32 arrays
+    the size of one frame no matter how many frames are added. Once `min_frames`
+    frames have been stacked, pixels that deviate from the running mean by more than
+    `sigma` standard deviations (e.g. cosmic rays, satellites) are left out.
+
+    Per-frame statistics (background, noise and saturated fraction) are worked out
+    as each frame is added.
+
+    >>> import numpy as np
+    >>> from panoptes.pocs.utils.quicklook import RunningStack
+    >>> stack = RunningStack('PAN000_SC0001_19991231T235959')
+    >>> frame_stats = stack.add_frame(np.full((10, 10), 100, dtype=np.uint16))
+    >>> frame_stats['background']
+    100.0
+    >>> frame_stats = stack.add_frame(np.full((10, 10), 200, dtype=np.uint16))
+    >>> stack.num_frames
+    2
+    >>> float(stack.mean[0, 0])
+    150.0
+
+    Args:
+        sequence_id (str): The sequence the frames belong to.
+        sigma (float, optional): Clipping threshold in standard deviations, default 3.
+        min_frames (int, optional): Number of frames to stack before clipping starts,
+            default 3.
+        saturation_level (float, optional): Pixel value at or above which a pixel is
+            considered saturated. If not given the maximum of the frame dtype is used.
+    """
+
+    def __init__(self, sequence_id, sigma=3.0, min_frames=3, saturation_level=None):
+        self.sequence_id = sequence_id
+        self.sigma = sigma
+        self.min_frames = min_frames
+        self.saturation_level = saturation_level
+
+        self.frame_stats = list()
+
+        self._count = None
+        self._mean = None
+        self._m2 = None
+        self._lock = threading.Lock()
+
+    @property
+    def num_frames(self):
+        """Number of frames that have been added to the stack."""
+        return len(self.frame_stats)
+
+    @property
+    def mean(self):
+        """The current co-added (mean) image, or None if no frames added."""
+        return self._mean
+
+    @property
+    def std(self):
+        """The current per-pixel standard deviation, or None if no frames added."""
+        if self._m2 is None:
+            return None
+        return np.sqrt(self._m2 / np.maximum(self._count - 1, 1))
+
+    def add_frame(self, data, image_id=None):
+        """Add a frame to the stack.
+
+        Args:
+            data (numpy.ndarray): The image data.
+            image_id (str, optional): The image_id of the frame, stored with the stats.
+
+        Returns:
+            dict: The statistics for the frame.
+        """
+        saturation_level = self.saturation_level
+        if saturation_level is None:
+            if np.issubdtype(data.dtype, np.integer):
+                saturation_level = np.iinfo(data.dtype).max
+            else:
+                saturation_level = np.inf
+
+        frame = data.astype(np.float32)
+        _, background, noise = sigma_clipped_stats(frame, sigma=self.sigma)
+
+        frame_stats = {
+            'image_id': image_id,
+            'background': float(background),
+            'noise': float(noise),
+            'saturated_fraction': float(np.count_nonzero(data >= saturation_level) / data.size),
+        }
+
+        with self._lock:
+            if self._mean is None:
+                self._count = np.zeros(frame.shape, dtype=np.uint16)
+                self._mean = np.zeros(frame.shape, dtype=np.float32)
+                self._m2 = np.zeros(frame.shape, dtype=np.float32)
+
+            if self.num_frames >= self.min_frames:
+                keep = np.abs(frame - self._mean) <= self.sigma * self.std
+            else:
+                keep = np.ones(frame.shape, dtype=bool)
+
+            # Welford update of the running mean and variance for the kept pixels.
+            self._count += keep
+            delta = np.where(keep, frame - self._mean, 0)
+            self._mean += delta / np.maximum(self._count, 1)
+            self._m2 += delta * np.where(keep, frame - self._mean, 0)
+
+            self.frame_stats.append(frame_stats)
+
+        return frame_stats
+
+    def write(self, fits_path, jpeg_path=None):
+        """Write the co-added image to a FITS file and optionally a JPEG.
+
+        Args:
+            fits_path (str): Path for the FITS file, will be overwritten.
+            jpeg_path (str, optional): Path for a JPEG version of the co-added image.
+
+        Returns:
+            str: The path to the FITS file.
+        """
+        with self._lock:
+            if self._mean is None:
+                raise ValueError(f'No frames in stack for {self.sequence_id}')
+            stacked = self._mean.copy()
+            num_frames = self.num_frames
+
+        header = fits.Header()
+        header.set('SEQID', self.sequence_id)
+        header.set('NCOMBINE', num_frames, 'Number of frames in co-add')
+        header.set('COMBTYPE', 'MEAN', f'Sigma clipped at {self.sigma}')
+
+        os.makedirs(os.path.dirname(fits_path) or '.', exist_ok=True)
+        fits.writeto(fits_path, stacked, header=header, overwrite=True)
+        logger.debug(f'Wrote quick-look co-add of {num_frames} frames to {fits_path}')
+
+        if jpeg_path is not None:
+            vmin, vmax = np.percentile(stacked, [1, 99.5])
+            mpimg.imsave(jpeg_path, stacked, vmin=vmin, vmax=vmax, cmap='gray', origin='lower')
+            logger.debug(f'Wrote quick-look JPEG to {jpeg_path}')
+
+        return fits_path